@@ -1,22 +1,40 @@
 import os
 import numpy as np
 from board import Board
-from tensorflow.keras.models import Sequential, load_model
-from tensorflow.keras.layers import Dense, Input
+from cache import EvaluationCache, model_fingerprint, position_hash
+from search import ParallelSearch
 
 
 class CheckersAIModel:
-    def __init__(self):
+    def __init__(self, quantized_filepath=None, cache=None):
         self.board = Board()
+        self.cache = cache if cache is not None else EvaluationCache()
+        # Kept between moves so the worker pool and its transposition tables
+        # are reused; release it with close().
+        self.search = None
         model_filepath = "trained_checkers_model.h5"
-        if os.path.exists(model_filepath):
+        if quantized_filepath is not None:
+            # Quantized models run in NumPy and do not need TensorFlow.
+            from quantize import QuantizedModel
+
+            self.model = QuantizedModel.load(quantized_filepath)
+            print(
+                f"Successfully loaded quantized model from file: {quantized_filepath}"
+            )
+            self.cache.set_model(model_fingerprint(quantized_filepath))
+        elif os.path.exists(model_filepath):
             self.model = self.load_model(model_filepath)
             print("Successfully loaded model from file")
+            self.cache.set_model(model_fingerprint(model_filepath))
         else:
             self.model = self._create_model()
             print("Created a new model")
+            self.cache.set_model(None)
 
     def _create_model(self):
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense, Input
+
         model = Sequential(
             [
                 Input(shape=(64,)),
@@ -31,6 +49,8 @@ class CheckersAIModel:
         return model
 
     def load_model(self, filepath):
+        from tensorflow.keras.models import load_model
+
         model = load_model(filepath)
         model.compile(
             optimizer="adam", loss="categorical_crossentropy", metrics=["accuracy"]
@@ -41,48 +61,110 @@ class CheckersAIModel:
     def save_model(self, filepath):
         self.model.save(filepath)
         print(f"Model saved to file: {filepath}")
+        # The saved file now holds exactly the weights in memory.
+        self.cache.set_model(model_fingerprint(filepath))
 
-    def train(self, X, y, epochs=1, batch_size=32):
+    def train(self, X, y, epochs=1, batch_size=32, sample_weight=None):
         print("Starting model training...")
-        self.model.fit(X, y, epochs=epochs, batch_size=batch_size)
+        self.model.fit(
+            X, y, epochs=epochs, batch_size=batch_size, sample_weight=sample_weight
+        )
+        # Cached predictions were made with the old weights, and the new ones
+        # are not persisted until they are saved to a file.
+        self.cache.set_model(None)
         print("Training completed!")
 
     def generate_valid_move(self, board_state, last_computer_move):
         print("Starting computer move generation...")
-        board_array = self.convert_board_to_array(board_state)
-        print("Board array representation:", board_array)
-
-        predictions = self.model.predict(board_array)[0]
+        key = position_hash(board_state)
+        predictions = self.cache.get(key)
+        if predictions is None:
+            board_array = self.convert_board_to_array(board_state)
+            print("Board array representation:", board_array)
+
+            predictions = self.model.predict(board_array)[0]
+            self.cache.put(key, predictions)
+        else:
+            print("Using cached model predictions")
 
         print("Model predictions:", predictions)
 
+        return self.select_move(board_state, predictions, last_computer_move)
+
+    def search_move(self, board_state, workers=1, time_limit=1.0, max_depth=32):
+        print("Starting computer move search...")
+        board = Board()
+        board.set_grid(board_state)
+        if self.search is None or self.search.workers != workers:
+            self.close()
+            self.search = ParallelSearch(workers, time_limit, max_depth)
+        self.search.time_limit = time_limit
+        self.search.max_depth = max_depth
+        result = self.search.search(board, "B")
+        print(f"Search result: {result}")
+        if result.move is None:
+            raise ValueError("Cannot generate a valid move.")
+        return board.move_to_string(result.move)
+
+    def close(self):
+        if self.search is not None:
+            self.search.close()
+            self.search = None
+
+    def predict_batch(self, board_states):
+        predictions = np.zeros((len(board_states), 64), dtype=np.float32)
+        keys = [position_hash(board_state) for board_state in board_states]
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key)
+            if cached is None:
+                missing.append(i)
+            else:
+                predictions[i] = cached
+
+        if missing:
+            batch = np.concatenate(
+                [self.convert_board_to_array(board_states[i]) for i in missing]
+            )
+            computed = self.model.predict(batch, batch_size=len(missing), verbose=0)
+            for i, prediction in zip(missing, computed):
+                predictions[i] = prediction
+                self.cache.put(keys[i], prediction)
+        return predictions
+
+    def select_move(self, board_state, predictions, last_computer_move, quiet=False):
+        log = print if not quiet else lambda *args: None
         sorted_indices = np.argsort(-predictions)
-        print("Sorted indices by probability:", sorted_indices)
+        log("Sorted indices by probability:", sorted_indices)
 
-        black_positions = self.get_black_positions(board_state)
-        print("Positions of black pieces:", black_positions)
+        black_positions = self.get_black_positions(board_state, quiet)
+        log("Positions of black pieces:", black_positions)
 
         for from_pos in black_positions:
 
-            captures = self.get_valid_captures(board_state, from_pos)
-            print(f"board_state: {board_state}", f"from_pos: {from_pos}")
+            captures = self.get_valid_captures(board_state, from_pos, quiet)
+            if not quiet:
+                print(f"board_state: {board_state}", f"from_pos: {from_pos}")
             if captures:
 
-                print(f"Found possible captures for piece at {from_pos}: {captures}")
+                log(f"Found possible captures for piece at {from_pos}: {captures}")
                 return captures[0]
 
         for from_pos in black_positions:
-            print(f"Processing moves for piece at {from_pos}")
+            log(f"Processing moves for piece at {from_pos}")
             for idx in sorted_indices:
                 to_pos = idx % 64 + 1
+                if quiet and to_pos > 32:
+                    # Positions above 32 are off the board, see is_valid_move.
+                    continue
                 move = f"{from_pos}-{to_pos}"
-                print(f"Checking move: {move}")
+                log(f"Checking move: {move}")
 
-                if self.is_valid_move(board_state, move, last_computer_move):
-                    print("Found a valid move:", move)
+                if self.is_valid_move(board_state, move, last_computer_move, quiet):
+                    log("Found a valid move:", move)
                     return move
 
-        print("No valid move found.")
+        log("No valid move found.")
         raise ValueError("Cannot generate a valid move.")
 
     def convert_board_to_array(self, board_state):
@@ -96,25 +178,26 @@ class CheckersAIModel:
                     board_array[0, index] = 2.0
         return board_array
 
-    def is_valid_move(self, board, move, last_computer_move):
+    def is_valid_move(self, board, move, last_computer_move, quiet=False):
+        log = print if not quiet else lambda *args: None
 
-        print(f"Checking move validity: {move}")
+        log(f"Checking move validity: {move}")
         try:
             fp, tp = map(int, move.split("-"))
             fr, fc = self.position_to_coords(fp)
             tr, tc = self.position_to_coords(tp)
-            print(f"Positions: Start ({fr}, {fc}), Target ({tr}, {tc})")
+            log(f"Positions: Start ({fr}, {fc}), Target ({tr}, {tc})")
 
             if board[fr][fc] != "B":
-                print(
+                log(
                     f"Invalid move: Starting position {fp} does not contain a black piece."
                 )
                 return False
             if not (0 <= tr < 8 and 0 <= tc < 8):
-                print("Invalid move: Target position is off the board.")
+                log("Invalid move: Target position is off the board.")
                 return False
             if board[tr][tc] is not None:
-                print("Invalid move: Target position is occupied.")
+                log("Invalid move: Target position is occupied.")
                 return False
 
             if last_computer_move is not None:
@@ -132,37 +215,37 @@ class CheckersAIModel:
                         f"{last_computer_move[2]}-{last_computer_move[0]}"
                     )
 
-                print(f"Last computer move: {last_computer_move}")
-                print(f"Reversed last computer move: {r_last_computer_move}")
+                log(f"Last computer move: {last_computer_move}")
+                log(f"Reversed last computer move: {r_last_computer_move}")
 
                 if move == last_computer_move or move == r_last_computer_move:
-                    print(
+                    log(
                         "Invalid move: Move is the same as the previous computer move."
                     )
                     return False
 
             else:
-                print("No last computer move.")
+                log("No last computer move.")
 
             if tr <= fr:
                 return False
             
             if abs(fr - tr) == 1 and abs(fc - tc) == 1:
 
-                print("Standard move is valid.")
+                log("Standard move is valid.")
                 return True
 
             if abs(fr - tr) == 2 and abs(fc - tc) == 2:
                 mr, mc = (fr + tr) // 2, (fc + tc) // 2
-                print(f"Middle position: ({mr}, {mc})")
+                log(f"Middle position: ({mr}, {mc})")
                 if board[mr][mc] == "W":
-                    print("Capture move is valid.")
+                    log("Capture move is valid.")
                     return True
 
-            print("Invalid move.")
+            log("Invalid move.")
             return False
         except ValueError as e:
-            print(f"Invalid move: {e}")
+            log(f"Invalid move: {e}")
             return False
 
     def position_to_coords(self, pos):
@@ -212,21 +295,23 @@ class CheckersAIModel:
     #        y = np.array(y)
     #    print(f"Liczba partii używanych do nauki modelu: {len(games)}")
 
-    def get_black_positions(self, board_state):
-        print("Starting identification of black piece positions...")
+    def get_black_positions(self, board_state, quiet=False):
+        log = print if not quiet else lambda *args: None
+        log("Starting identification of black piece positions...")
         black_positions = []
         for row in range(8):
             for col in range(8):
                 if board_state[row][col] == "B":
                     pos = self.coords_to_position(row, col)
                     black_positions.append(pos)
-                    print(
+                    log(
                         f"Found black piece at position: {pos} (coordinates: {row}, {col})"
                     )
-        print("All black piece positions:", black_positions)
+        log("All black piece positions:", black_positions)
         return black_positions
 
-    def get_valid_captures(self, board, from_pos):
+    def get_valid_captures(self, board, from_pos, quiet=False):
+        log = print if not quiet else lambda *args: None
         fr, fc = self.position_to_coords(from_pos)
         captures = []
 
@@ -244,7 +329,7 @@ class CheckersAIModel:
                     and board[tr][tc] is None
                 ):
                     to_pos = self.coords_to_position(tr, tc)
-                    print(f"Found possible capture: {from_pos}x{to_pos}")
+                    log(f"Found possible capture: {from_pos}x{to_pos}")
                     captures.append(f"{from_pos}x{to_pos}")
 
         return captures
@@ -1,9 +1,11 @@
 import tkinter as tk
 from tkinter import PhotoImage
 from board import Board
-from data import data_loader
-from ai import CheckersAIModel
-import math
+import threading
+import time
+
+ANIMATION_FPS = 60
+ANIMATION_HOP_SECONDS = 0.25
 
 
 class CheckersApp:
@@ -32,13 +34,22 @@ class CheckersApp:
         self.player_turn = True
         self.last_computer_move = None
         self.game_runs = False
-
-        self.model = CheckersAIModel()
-        self.historical_moves = data_loader()
+        self.game_ended = False
+        self.animating = False
+        self.thinking_thread = None
+        self.computer_move = None
+        self.computer_error = None
+
+        # The model (TensorFlow import + h5 load) and the historical dataset
+        # are loaded lazily in background threads so the board shows at once.
+        self.model = None
+        self.model_status = "not loaded"
+        self.model_thread = None
+        self.historical_moves = None
+        self.training_thread = None
         self.current_move = 0
 
         self.create_widgets()
-        self.train_model()
 
     def wait(self):
         pass
@@ -46,10 +57,10 @@ class CheckersApp:
     def promote_to_king(self, row, col):
         piece = self.board.grid[row][col]
         if piece == "W" and row == 0:
-            self.board.grid[row][col] = "WK"
+            self.board.set_piece(row, col, "WK")
             print(f"Promoting white piece at ({row}, {col}) to king")
         elif piece == "B" and row == 7:
-            self.board.grid[row][col] = "BK"
+            self.board.set_piece(row, col, "BK")
             print(f"Promoting black piece at ({row}, {col}) to king")
 
     def animate_label(self):
@@ -60,12 +71,53 @@ class CheckersApp:
             self.master.after(250, self.animate_label)
 
     def update_game_label(self):
+        # Background model loading and training finish at any time and must
+        # not replace the result once the game is over.
+        if self.game_ended:
+            return
         if self.player_turn:
-            self.game_label.config(text="Player's turn")
+            text = "Player's turn"
         else:
-            self.game_label.config(text="Computer's turn")
+            text = "Computer's turn"
+        if self.model_status == "loading":
+            text += " (loading AI model...)"
+        elif self.model_status == "failed":
+            text += " (AI model failed to load)"
+        elif self.model_status == "training":
+            text += " (training AI model...)"
+        elif self.model_status == "training failed":
+            text += " (AI model training failed)"
+        self.game_label.config(text=text)
+
+    def ensure_model(self):
+        if self.model is not None or self.model_thread is not None:
+            return
+        self.model_status = "loading"
+        self.update_game_label()
+        self.model_thread = threading.Thread(target=self.load_model, daemon=True)
+        self.model_thread.start()
+        self.master.after(100, self.poll_model)
+
+    def load_model(self):
+        try:
+            from ai import CheckersAIModel
+
+            self.model = CheckersAIModel()
+            self.model_status = "ready"
+        except Exception as e:
+            print(f"Failed to load AI model: {e}")
+            self.model_status = "failed"
+
+    def poll_model(self):
+        if self.model_thread.is_alive():
+            self.master.after(100, self.poll_model)
+            return
+        print(f"AI model status: {self.model_status}")
+        if self.game_label.winfo_exists():
+            self.update_game_label()
 
     def game_over(self, winner):
+        self.game_ended = True
         self.game_label.config(text=f"Game Over! {winner} wins!")
 
     def check_game_over(self):
@@ -122,6 +174,11 @@ class CheckersApp:
 
         self.canvas.bind("<Button-1>", self.on_click)
 
+        self.train_button = tk.Button(
+            self.master, text="Train model", command=self.train_model
+        )
+        self.train_button.pack()
+
     def draw_board(self):
         self.canvas.delete("all")
         for row in range(8):
@@ -158,25 +215,103 @@ class CheckersApp:
                 if piece is not None:
                     x = col * 75 + 37.5
                     y = row * 75 + 37.5
+                    tag = self.piece_tag(row, col)
                     if piece == "B":
-                        self.draw_3d_piece(x, y, "black", "darkgray")
+                        self.draw_3d_piece(x, y, "black", "darkgray", tag)
                     elif piece == "BK":
-                        self.draw_3d_piece(x, y, "black", "gold")
+                        self.draw_3d_piece(x, y, "black", "gold", tag)
                     elif piece == "WK":
-                        self.draw_3d_piece(x, y, "white", "gold")
+                        self.draw_3d_piece(x, y, "white", "gold", tag)
                     else:
-                        self.draw_3d_piece(x, y, "white", "lightgray")
+                        self.draw_3d_piece(x, y, "white", "lightgray", tag)
 
-    def draw_3d_piece(self, x, y, color, shadow_color):
+    def draw_3d_piece(self, x, y, color, shadow_color, tag=None):
         self.canvas.create_oval(
-            x - 30, y - 30, x + 30, y + 30, fill=shadow_color, outline=shadow_color
+            x - 30,
+            y - 30,
+            x + 30,
+            y + 30,
+            fill=shadow_color,
+            outline=shadow_color,
+            tags=tag,
         )
         self.canvas.create_oval(
-            x - 27, y - 27, x + 27, y + 27, fill=color, outline="black"
+            x - 27, y - 27, x + 27, y + 27, fill=color, outline="black", tags=tag
+        )
+
+    def piece_tag(self, row, col):
+        return f"piece_{row}_{col}"
+
+    def redraw(self):
+        self.draw_board()
+        self.draw_pieces()
+
+    def animate_move(self, path, on_done):
+        # Slides the canvas items of the piece on path[0] through every square
+        # of path. Positions are computed from the elapsed time, so frames the
+        # event loop is too late for are dropped instead of slowing the move.
+        self.animating = True
+        tag = self.piece_tag(*path[0])
+        self.canvas.tag_raise(tag)
+        points = [(col * 75 + 37.5, row * 75 + 37.5) for row, col in path]
+        hops = len(points) - 1
+        duration = hops * ANIMATION_HOP_SECONDS
+        frame_interval = 1.0 / ANIMATION_FPS
+        start = time.perf_counter()
+        state = {"position": points[0], "frame": 0, "dropped": 0, "hops_done": 0}
+
+        def frame():
+            elapsed = time.perf_counter() - start
+            progress = min(elapsed / duration, 1.0) if duration else 1.0
+            completed = hops if progress >= 1.0 else int(progress * hops)
+            while state["hops_done"] < completed:
+                hop = state["hops_done"]
+                self.remove_jumped_piece(path[hop], path[hop + 1], tag)
+                state["hops_done"] += 1
+
+            if hops:
+                hop = min(int(progress * hops), hops - 1)
+                t = progress * hops - hop
+                (x0, y0), (x1, y1) = points[hop], points[hop + 1]
+                x, y = x0 + (x1 - x0) * t, y0 + (y1 - y0) * t
+                self.canvas.move(
+                    tag, x - state["position"][0], y - state["position"][1]
+                )
+                state["position"] = (x, y)
+
+            if progress >= 1.0:
+                self.animating = False
+                print(
+                    f"Animation finished: {state['frame']} frames, "
+                    f"{state['dropped']} dropped"
+                )
+                on_done()
+                return
+
+            next_frame = int(elapsed / frame_interval) + 1
+            state["dropped"] += max(next_frame - state["frame"] - 1, 0)
+            state["frame"] = next_frame
+            delay = next_frame * frame_interval - elapsed
+            self.master.after(max(1, int(delay * 1000)), frame)
+
+        frame()
+
+    def remove_jumped_piece(self, from_coords, to_coords, moving_tag):
+        if abs(from_coords[0] - to_coords[0]) != 2:
+            return
+        mid_tag = self.piece_tag(
+            (from_coords[0] + to_coords[0]) // 2, (from_coords[1] + to_coords[1]) // 2
         )
+        if mid_tag != moving_tag:
+            self.canvas.delete(mid_tag)
 
     def on_click(self, event):
 
+        self.ensure_model()
+
+        if self.animating:
+            return
+
         if self.game_label.winfo_exists():
             self.update_game_label()
 
@@ -222,8 +357,7 @@ class CheckersApp:
 
                 if self.possible_captures:
                     print(f"Double capture possible at {self.possible_captures}")
-                    self.draw_board()
-                    self.draw_pieces()
+                    self.animate_move([(old_row, old_col), (row, col)], self.redraw)
                     return
 
                 self.selected_piece = None
@@ -237,10 +371,12 @@ class CheckersApp:
                 self.update_game_label()
                 print("Player's move completed, switching to computer's turn.")
                 self.promote_to_king(row, col)
-                self.draw_board()
-                self.draw_pieces()
 
-                self.master.after(2000, self.handle_computer_move)
+                self.start_computer_thinking()
+                self.animate_move(
+                    [(old_row, old_col), (row, col)], self.finish_player_move
+                )
+                return
             elif (row, col) in self.possible_moves:
                 old_row, old_col = self.selected_piece
                 self.board.move_piece(old_row, old_col, row, col)
@@ -255,10 +391,12 @@ class CheckersApp:
                 self.update_game_label()
                 print("Player's move completed, switching to computer's turn.")
                 self.promote_to_king(row, col)
-                self.draw_board()
-                self.draw_pieces()
 
-                self.master.after(2000, self.handle_computer_move)
+                self.start_computer_thinking()
+                self.animate_move(
+                    [(old_row, old_col), (row, col)], self.finish_player_move
+                )
+                return
 
         self.draw_board()
         self.draw_pieces()
@@ -269,49 +407,86 @@ class CheckersApp:
         print(f"Converted position {position} to coordinates ({row}, {col})")
         return row, col
 
+    def finish_player_move(self):
+        self.redraw()
+        self.handle_computer_move()
+
+    def start_computer_thinking(self):
+        # The move is computed in a background thread on a copy of the board
+        # so that it overlaps with the animation of the previous move.
+        self.ensure_model()
+        grid = [list(row) for row in self.board.grid]
+        last_computer_move = self.last_computer_move
+        self.computer_move = None
+        self.computer_error = None
+
+        def think():
+            if self.model_thread is not None:
+                self.model_thread.join()
+            if self.model is None:
+                self.computer_error = "AI model is not available"
+                return
+            try:
+                self.computer_move = self.model.generate_valid_move(
+                    grid, last_computer_move
+                )
+            except ValueError as e:
+                self.computer_error = str(e)
+
+        self.thinking_thread = threading.Thread(target=think, daemon=True)
+        self.thinking_thread.start()
+
     def handle_computer_move(self):
-        def make_move():
-            move = self.model.generate_valid_move(
-                self.board.grid, self.last_computer_move
+        if self.thinking_thread is None:
+            self.start_computer_thinking()
+        if self.thinking_thread.is_alive():
+            self.master.after(int(1000 / ANIMATION_FPS), self.handle_computer_move)
+            return
+        self.thinking_thread = None
+
+        if self.computer_error is not None:
+            print(f"Computer could not move: {self.computer_error}")
+            self.game_label.config(
+                text=f"Computer could not move: {self.computer_error}"
             )
-            print(f"Computer's move: {move}")
-            self.process_move(move, "B")
-            self.current_move += 1
+            return
 
-            if self.check_game_over():
-                return
+        move = self.computer_move
+        print(f"Computer's move: {move}")
+        path = [
+            self.position_to_coords(int(pos))
+            for pos in move.replace("x", "-").split("-")
+        ]
+        self.animate_move(path, lambda: self.finish_computer_move(move))
 
-            if "-" in move:
-                from_pos, to_pos = map(int, move.split("-"))
-                self.player_turn = True
-                self.update_game_label()
-                print("Computer's move completed, switching to player's turn.")
-                self.draw_board()
-                self.draw_pieces()
+    def finish_computer_move(self, move):
+        self.process_move(move, "B")
+        self.current_move += 1
 
-            elif "x" in move:
-                from_pos, to_pos = map(int, move.split("x"))
+        if self.check_game_over():
+            return
 
-                from_row, from_col = self.position_to_coords(from_pos)
-                to_row, to_col = self.position_to_coords(to_pos)
+        if "-" in move:
+            self.player_turn = True
+            self.update_game_label()
+            print("Computer's move completed, switching to player's turn.")
+            self.redraw()
 
-                self.possible_captures = self.board.get_possible_captures(
-                    to_row, to_col
-                )
-                print(
-                    f"Possible captures after computer's move: {self.possible_captures}"
-                )
+        elif "x" in move:
+            to_pos = int(move.split("x")[-1])
+            to_row, to_col = self.position_to_coords(to_pos)
 
-                if self.possible_captures:
-                    self.master.after(2000, make_move)
-                else:
-                    self.player_turn = True
-                    self.update_game_label()
-                    print("Computer's move completed, switching to player's turn.")
-                    self.draw_board()
-                    self.draw_pieces()
+            self.possible_captures = self.board.get_possible_captures(to_row, to_col)
+            print(f"Possible captures after computer's move: {self.possible_captures}")
 
-        make_move()
+            if self.possible_captures:
+                self.start_computer_thinking()
+                self.handle_computer_move()
+            else:
+                self.player_turn = True
+                self.update_game_label()
+                print("Computer's move completed, switching to player's turn.")
+                self.redraw()
 
     def process_move(self, segment, piece_color):
         print(f"Processing move segment: {segment} for piece color {piece_color}")
@@ -323,7 +498,41 @@ class CheckersApp:
             self.process_single_move(segment, piece_color)
 
     def train_model(self):
-        self.model.train_model(self.historical_moves)
+        if self.training_thread is not None and self.training_thread.is_alive():
+            return
+        self.train_button.config(state=tk.DISABLED)
+        # The model is only ever loaded from the main thread, so training and
+        # the computer's first move cannot both start a load.
+        self.ensure_model()
+        self.training_thread = threading.Thread(target=self.run_training, daemon=True)
+        self.training_thread.start()
+        self.master.after(100, self.poll_training)
+
+    def run_training(self):
+        self.model_thread.join()
+        if self.model is None:
+            return
+        self.model_status = "training"
+        try:
+            if self.historical_moves is None:
+                from data import data_loader
+
+                self.historical_moves = data_loader()
+            self.model.train_model(self.historical_moves)
+            self.model_status = "ready"
+        except Exception as e:
+            print(f"Training failed: {e}")
+            self.model_status = "training failed"
+
+    def poll_training(self):
+        if self.training_thread.is_alive():
+            if self.game_label.winfo_exists():
+                self.update_game_label()
+            self.master.after(250, self.poll_training)
+            return
+        self.train_button.config(state=tk.NORMAL)
+        if self.game_label.winfo_exists():
+            self.update_game_label()
 
     def process_single_move(self, move, piece_color):
         if "x" in move:
@@ -334,40 +543,17 @@ class CheckersApp:
 
                 to_pos = int(to_pos_str)
 
-                if from_pos in (
-                    5,
-                    6,
-                    7,
-                    8,
-                    13,
-                    14,
-                    15,
-                    16,
-                    21,
-                    22,
-                    23,
-                    24,
-                    29,
-                    30,
-                    31,
-                    32,
-                ):
-
-                    capture_pos = int(math.floor((from_pos + to_pos) / 2))
-
-                else:
-
-                    capture_pos = int(math.ceil((from_pos + to_pos) / 2))
-
-                capture_coords = self.position_to_coords(capture_pos)
+                from_coords = self.position_to_coords(from_pos)
+                to_coords = self.position_to_coords(to_pos)
+                capture_coords = (
+                    (from_coords[0] + to_coords[0]) // 2,
+                    (from_coords[1] + to_coords[1]) // 2,
+                )
 
                 if piece_color == "B":
                     print(f"Removing captured piece at {capture_coords}")
                     self.board.remove_piece(capture_coords[0], capture_coords[1])
 
-                from_coords = self.position_to_coords(from_pos)
-                to_coords = self.position_to_coords(to_pos)
-
                 self.board.move_piece(
                     from_coords[0], from_coords[1], to_coords[0], to_coords[1]
                 )
@@ -383,7 +569,7 @@ class CheckersApp:
             )
 
         if piece_color == "B" and to_coords[0] == 7:
-            self.board.grid[to_coords[0]][to_coords[1]] = "BK"
+            self.board.set_piece(to_coords[0], to_coords[1], "BK")
             print(f"Promoting black piece at {to_coords} to king")
 
         if piece_color == "B":
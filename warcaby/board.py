@@ -1,18 +1,66 @@
+import evaluation
+
+
 class Board:
 
     def __init__(self):
         self.grid = [[None for _ in range(8)] for _ in range(8)]
+        self.score = 0
+        self.weights_version = evaluation.version
         self.initialize_pieces()
 
     def initialize_pieces(self):
         for row in range(3):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    self.grid[row][col] = "B"
+                    self.set_piece(row, col, "B")
         for row in range(5, 8):
             for col in range(8):
                 if (row + col) % 2 == 1:
-                    self.grid[row][col] = "W"
+                    self.set_piece(row, col, "W")
+
+    # Static evaluation (see evaluation.py) kept up to date on every change:
+    # a square only affects its own table value and the mobility of itself
+    # and its diagonal neighbours, so each update is O(1). After the weights
+    # change, evaluate() recomputes the score of boards built with old ones.
+
+    def set_piece(self, row, col, piece):
+        self.score -= self._local_score(row, col)
+        self.grid[row][col] = piece
+        self.score += self._local_score(row, col)
+
+    def set_grid(self, grid):
+        self.grid = [list(row) for row in grid]
+        self.recompute_score()
+
+    def recompute_score(self):
+        self.weights_version = evaluation.version
+        self.score = 0
+        for row in range(8):
+            for col in range(8):
+                self.score += self._square_score(row, col)
+
+    def _square_score(self, row, col):
+        piece = self.grid[row][col]
+        if piece is None:
+            return 0
+        mobility = 0
+        for dr, dc in self.piece_directions(piece):
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8 and self.grid[r][c] is None:
+                mobility += 1
+        return (
+            evaluation.tables[piece][row][col]
+            + evaluation.mobility_weights[piece] * mobility
+        )
+
+    def _local_score(self, row, col):
+        score = self._square_score(row, col)
+        for dr, dc in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+            r, c = row + dr, col + dc
+            if 0 <= r < 8 and 0 <= c < 8:
+                score += self._square_score(r, c)
+        return score
 
     """
     def get_possible_moves(self, row, col):
@@ -73,11 +121,12 @@ class Board:
         return moves
 
     def move_piece(self, from_row, from_col, to_row, to_col):
-        self.grid[to_row][to_col] = self.grid[from_row][from_col]
-        self.grid[from_row][from_col] = None
+        piece = self.grid[from_row][from_col]
+        self.set_piece(from_row, from_col, None)
+        self.set_piece(to_row, to_col, piece)
 
     def remove_piece(self, row, col):
-        self.grid[row][col] = None
+        self.set_piece(row, col, None)
 
     def position_to_coords(self, pos):
         if not (1 <= pos <= 64):
@@ -89,6 +138,113 @@ class Board:
         c = ((pos - 1) % 4) * 2 + (1 if r % 2 == 0 else 0)
         return r, c
 
+    def coords_to_position(self, row, col):
+        if not (0 <= row < 8 and 0 <= col < 8) or (row + col) % 2 == 0:
+            raise ValueError(
+                f"Invalid coordinates: ({row}, {col}). Must be a dark square."
+            )
+        return row * 4 + (col // 2) + 1
+
+    def position_key(self):
+        return tuple(tuple(row) for row in self.grid)
+
+    # Legal move generation used by the engines (search, self-play, game
+    # records). It follows English draughts rules: captures are mandatory,
+    # multi-jumps must be completed, men move and capture forward only,
+    # kings move one square in any direction and a man reaching the last
+    # row is crowned, which ends the move.
+    # A move is a (path, captured) pair of coordinate tuples.
+
+    def get_legal_moves(self, color):
+        captures = []
+        moves = []
+        for row in range(8):
+            for col in range(8):
+                piece = self.grid[row][col]
+                if piece is None or piece[0] != color:
+                    continue
+                captures += self.get_capture_sequences(row, col)
+                if not captures:
+                    for dr, dc in self.piece_directions(piece):
+                        r, c = row + dr, col + dc
+                        if 0 <= r < 8 and 0 <= c < 8 and self.grid[r][c] is None:
+                            moves.append((((row, col), (r, c)), ()))
+        return captures if captures else moves
+
+    def piece_directions(self, piece):
+        if piece == "B":
+            return [(1, -1), (1, 1)]
+        if piece == "W":
+            return [(-1, -1), (-1, 1)]
+        return [(-1, -1), (-1, 1), (1, -1), (1, 1)]
+
+    def get_capture_sequences(self, row, col):
+        piece = self.grid[row][col]
+        if piece is None:
+            return []
+        # Lift the piece so the starting square counts as empty during jumps.
+        self.grid[row][col] = None
+        sequences = []
+        self._extend_captures(piece, ((row, col),), (), sequences)
+        self.grid[row][col] = piece
+        return sequences
+
+    def _extend_captures(self, piece, path, captured, sequences):
+        row, col = path[-1]
+        extended = False
+        for dr, dc in self.piece_directions(piece):
+            mid_r, mid_c = row + dr, col + dc
+            dest_r, dest_c = row + 2 * dr, col + 2 * dc
+            if not (0 <= dest_r < 8 and 0 <= dest_c < 8):
+                continue
+            mid_piece = self.grid[mid_r][mid_c]
+            if (
+                mid_piece is None
+                or mid_piece[0] == piece[0]
+                or (mid_r, mid_c) in captured
+                or self.grid[dest_r][dest_c] is not None
+            ):
+                continue
+            extended = True
+            new_path = path + ((dest_r, dest_c),)
+            new_captured = captured + ((mid_r, mid_c),)
+            if self.promotes(piece, dest_r):
+                sequences.append((new_path, new_captured))
+            else:
+                self._extend_captures(piece, new_path, new_captured, sequences)
+        if not extended and captured:
+            sequences.append((path, captured))
+
+    def promotes(self, piece, row):
+        return (piece == "B" and row == 7) or (piece == "W" and row == 0)
+
+    def make_move(self, move):
+        path, captured = move
+        (from_row, from_col), (to_row, to_col) = path[0], path[-1]
+        piece = self.grid[from_row][from_col]
+        captured_pieces = tuple(self.grid[r][c] for r, c in captured)
+        for r, c in captured:
+            self.set_piece(r, c, None)
+        self.set_piece(from_row, from_col, None)
+        self.set_piece(
+            to_row, to_col, piece + "K" if self.promotes(piece, to_row) else piece
+        )
+        return piece, captured_pieces
+
+    def unmake_move(self, move, undo):
+        path, captured = move
+        (from_row, from_col), (to_row, to_col) = path[0], path[-1]
+        piece, captured_pieces = undo
+        self.set_piece(to_row, to_col, None)
+        self.set_piece(from_row, from_col, piece)
+        for (r, c), captured_piece in zip(captured, captured_pieces):
+            self.set_piece(r, c, captured_piece)
+
+    def move_to_string(self, move):
+        path, captured = move
+        positions = [str(self.coords_to_position(r, c)) for r, c in path]
+        return ("x" if captured else "-").join(positions)
+
     def get_possible_captures(self, row, col):
         piece = self.grid[row][col]
 
@@ -0,0 +1,143 @@
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+PIECE_CODES = {None: ".", "B": "b", "BK": "B", "W": "w", "WK": "W"}
+
+
+def position_hash(board_state):
+    # One character per dark square, e.g. "bbbbbbbbbbbb........wwwwwwwwwwww".
+    return "".join(
+        PIECE_CODES[board_state[row][col]]
+        for row in range(8)
+        for col in range(8)
+        if (row + col) % 2 == 1
+    )
+
+
+def model_fingerprint(filepath):
+    # Content hash of a weights file, so rows written for one model are never
+    # returned for another one saved under the same path.
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+class EvaluationCache:
+    def __init__(
+        self, capacity=4096, persist_path=None, persist_min_pieces=20, model_id=None
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+        # Only early-game positions (many pieces left) are written to disk:
+        # they repeat across games, while later positions rarely do.
+        # Rows are keyed by model_id as well as by position; without a
+        # model_id (e.g. weights that were never saved) nothing goes to disk.
+        self.persist_min_pieces = persist_min_pieces
+        self.model_id = model_id
+        self.db = None
+        if persist_path is not None:
+            self.db = sqlite3.connect(persist_path, check_same_thread=False)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS model_evaluations "
+                "(model TEXT, key TEXT, value BLOB, PRIMARY KEY (model, key))"
+            )
+            self.db.commit()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+            if self.db is not None and self.model_id is not None:
+                row = self.db.execute(
+                    "SELECT value FROM model_evaluations WHERE model = ? AND key = ?",
+                    (self.model_id, key),
+                ).fetchone()
+                if row is not None:
+                    value = np.frombuffer(row[0], dtype=np.float32)
+                    self._store(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        value = np.asarray(value, dtype=np.float32)
+        with self.lock:
+            self._store(key, value)
+            if (
+                self.db is not None
+                and self.model_id is not None
+                and self.is_early_game(key)
+            ):
+                self.db.execute(
+                    "INSERT OR REPLACE INTO model_evaluations (model, key, value) "
+                    "VALUES (?, ?, ?)",
+                    (self.model_id, key, value.tobytes()),
+                )
+                self.db.commit()
+
+    def _store(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def is_early_game(self, key):
+        return sum(code != "." for code in key) >= self.persist_min_pieces
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.entries),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def set_model(self, model_id):
+        # Called whenever the weights change. Entries in memory belong to the
+        # previous weights; rows on disk stay valid for their own model_id.
+        with self.lock:
+            self.entries.clear()
+            self.model_id = model_id
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            if self.db is not None and self.model_id is not None:
+                self.db.execute(
+                    "DELETE FROM model_evaluations WHERE model = ?", (self.model_id,)
+                )
+                self.db.commit()
+
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
@@ -1,17 +1,28 @@
 from datasets import load_dataset
+from records import MoveParseError, parse_moves
 
 
-def data_loader():
+def load_raw_games():
     # Load the dataset from Hugging Face
     dataset = load_dataset("NikolaiZhdanov/historical-checkers-games")
-    
+    # Each game is stored as a string of moves, usually separated by commas
+    return [game['moves'] for game in dataset['train']]  # Adjust 'train' as per dataset structure
+
+
+def data_loader():
     # Parse the dataset to extract moves as lists of moves
     games = []
-    for game in dataset['train']:  # Adjust 'train' as per dataset structure
-        # Each game is stored as a string, split by commas for individual moves
-        moves = game['moves'].split(',')
+    skipped = 0
+    for raw_moves in load_raw_games():
+        try:
+            moves = parse_moves(raw_moves)
+        except MoveParseError:
+            skipped += 1
+            continue
         games.append(moves)
-    
+
+    if skipped:
+        print(f"Skipped {skipped} games with unparseable moves")
     return games
 
 
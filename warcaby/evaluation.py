@@ -0,0 +1,82 @@
+import json
+import os
+
+WEIGHTS_FILEPATH = "evaluation_weights.json"
+
+DEFAULT_WEIGHTS = {
+    "man": 100,
+    "king": 160,
+    "back_rank": 12,
+    "center": 6,
+    "tempo": 2,
+    "mobility": 3,
+}
+
+CENTER_SQUARES = {(2, 3), (2, 5), (3, 2), (3, 4), (4, 3), (4, 5), (5, 2), (5, 4)}
+PIECES = ("B", "BK", "W", "WK")
+
+# Scores are from black's point of view; white pieces count negatively.
+weights = dict(DEFAULT_WEIGHTS)
+tables = {}
+mobility_weights = {}
+# Incremented whenever the tables are rebuilt; boards compare it with the
+# version their score was computed with.
+version = 0
+
+
+def build_tables():
+    global version
+    version += 1
+    tables.clear()
+    mobility_weights.clear()
+    for piece in PIECES:
+        sign = 1 if piece[0] == "B" else -1
+        is_king = len(piece) == 2
+        table = [[0] * 8 for _ in range(8)]
+        for row in range(8):
+            for col in range(8):
+                if (row + col) % 2 == 0:
+                    continue
+                # Rows advanced from the piece's own back rank.
+                advance = row if piece[0] == "B" else 7 - row
+                value = weights["king"] if is_king else weights["man"]
+                if not is_king:
+                    value += weights["tempo"] * advance
+                    if advance == 0:
+                        value += weights["back_rank"]
+                if (row, col) in CENTER_SQUARES:
+                    value += weights["center"]
+                table[row][col] = sign * value
+        tables[piece] = table
+        mobility_weights[piece] = sign * weights["mobility"]
+
+
+def set_weights(new_weights):
+    unknown = set(new_weights) - set(DEFAULT_WEIGHTS)
+    if unknown:
+        raise ValueError(f"Unknown evaluation weights: {sorted(unknown)}")
+    weights.update(new_weights)
+    build_tables()
+
+
+def load_weights(filepath):
+    with open(filepath, encoding="utf-8") as f:
+        set_weights(json.load(f))
+    print(f"Evaluation weights loaded from file: {filepath}")
+
+
+def save_weights(filepath):
+    with open(filepath, "w", encoding="utf-8") as f:
+        json.dump(weights, f, indent=4)
+    print(f"Evaluation weights saved to file: {filepath}")
+
+
+def evaluate(board, color):
+    if board.weights_version != version:
+        board.recompute_score()
+    return board.score if color == "B" else -board.score
+
+
+build_tables()
+if os.path.exists(WEIGHTS_FILEPATH):
+    load_weights(WEIGHTS_FILEPATH)
@@ -0,0 +1,232 @@
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from board import Board
+
+DTYPES = ("float32", "float16", "int8")
+
+
+def relu(x):
+    return np.maximum(x, 0.0)
+
+
+def softmax(x):
+    x = x - np.max(x, axis=1, keepdims=True)
+    e = np.exp(x)
+    return e / np.sum(e, axis=1, keepdims=True)
+
+
+def linear(x):
+    return x
+
+
+ACTIVATIONS = {"relu": relu, "softmax": softmax, "linear": linear}
+
+
+def quantize_symmetric(values):
+    # Symmetric int8 quantization: values ~= q * scale with q in [-127, 127].
+    max_abs = np.max(np.abs(values))
+    scale = np.float32(max_abs / 127.0 if max_abs > 0 else 1.0)
+    q = np.clip(np.round(values / scale), -127, 127).astype(np.int8)
+    return q, scale
+
+
+def keras_dense_layers(model):
+    weights, activations = [], []
+    for layer in model.layers:
+        layer_weights = layer.get_weights()
+        if len(layer_weights) != 2:
+            continue
+        weights.append(layer_weights)
+        activations.append(layer.get_config().get("activation", "linear"))
+    return weights, activations
+
+
+class QuantizedModel:
+    def __init__(self, layers, dtype):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unsupported dtype: {dtype}. Must be one of {DTYPES}.")
+        self.layers = layers
+        self.dtype = dtype
+        # int8/float16 only make the saved file smaller. Weights are expanded
+        # to float32 once here, because NumPy has no int8 x int8 -> int32 BLAS
+        # path and its integer matmul is far slower than float32. Inference
+        # speed and resident memory are therefore the same as the float model.
+        self.kernels = [
+            layer["kernel"].astype(np.float32) * layer["scale"] for layer in layers
+        ]
+
+    @classmethod
+    def from_weights(cls, weights, activations, dtype="int8"):
+        layers = []
+        for (kernel, bias), activation in zip(weights, activations):
+            kernel = np.asarray(kernel, dtype=np.float32)
+            if dtype == "int8":
+                kernel, scale = quantize_symmetric(kernel)
+            else:
+                kernel, scale = kernel.astype(dtype), np.float32(1.0)
+            layers.append(
+                {
+                    "kernel": kernel,
+                    "scale": np.float32(scale),
+                    "bias": np.asarray(bias, dtype=np.float32),
+                    "activation": activation,
+                }
+            )
+        return cls(layers, dtype)
+
+    @classmethod
+    def from_keras(cls, model, dtype="int8"):
+        weights, activations = keras_dense_layers(model)
+        return cls.from_weights(weights, activations, dtype)
+
+    @classmethod
+    def load(cls, filepath):
+        data = np.load(filepath)
+        dtype = str(data["dtype"])
+        layers = []
+        for i in range(int(data["num_layers"])):
+            layers.append(
+                {
+                    "kernel": data[f"kernel_{i}"],
+                    "scale": np.float32(data[f"scale_{i}"]),
+                    "bias": data[f"bias_{i}"],
+                    "activation": str(data[f"activation_{i}"]),
+                }
+            )
+        print(f"Quantized model loaded from file: {filepath}")
+        return cls(layers, dtype)
+
+    def save(self, filepath):
+        arrays = {
+            "dtype": np.array(self.dtype),
+            "num_layers": np.array(len(self.layers)),
+        }
+        for i, layer in enumerate(self.layers):
+            arrays[f"kernel_{i}"] = layer["kernel"]
+            arrays[f"scale_{i}"] = np.array(layer["scale"])
+            arrays[f"bias_{i}"] = layer["bias"]
+            arrays[f"activation_{i}"] = np.array(layer["activation"])
+        with open(filepath, "wb") as f:
+            np.savez(f, **arrays)
+        print(f"Quantized model saved to file: {filepath}")
+
+    def size_in_bytes(self):
+        return sum(
+            layer["kernel"].nbytes + layer["bias"].nbytes for layer in self.layers
+        )
+
+    def predict(self, X, batch_size=None, verbose=0):
+        x = np.asarray(X, dtype=np.float32)
+        for layer, kernel in zip(self.layers, self.kernels):
+            x = np.matmul(x, kernel)
+            x = ACTIVATIONS[layer["activation"]](x + layer["bias"])
+        return x
+
+
+def board_to_input(grid):
+    # Same encoding as CheckersAIModel.convert_board_to_array.
+    row = np.zeros(64, dtype=np.float32)
+    for i, cells in enumerate(grid):
+        for j, cell in enumerate(cells):
+            if cell == "B":
+                row[i * 8 + j] = 1.0
+            elif cell == "W":
+                row[i * 8 + j] = 2.0
+    return row
+
+
+def sample_positions(count, seed=0, max_plies=60):
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        board = Board()
+        color = "B"
+        for _ in range(rng.randint(0, max_plies)):
+            moves = board.get_legal_moves(color)
+            if not moves:
+                break
+            board.make_move(rng.choice(moves))
+            color = "W" if color == "B" else "B"
+        positions.append(board_to_input(board.grid))
+    return np.stack(positions)
+
+
+def timed_predict(model, X, repeats=5):
+    best = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predictions = model.predict(X, batch_size=len(X), verbose=0)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return np.asarray(predictions), best
+
+
+def accuracy_report(reference, quantized, X):
+    expected, reference_time = timed_predict(reference, X)
+    actual, quantized_time = timed_predict(quantized, X)
+    error = np.abs(expected - actual)
+    return {
+        "positions": len(X),
+        "top1_agreement": float(
+            np.mean(np.argmax(expected, 1) == np.argmax(actual, 1))
+        ),
+        "mean_abs_error": float(np.mean(error)),
+        "max_abs_error": float(np.max(error)),
+        "reference_seconds": reference_time,
+        "quantized_seconds": quantized_time,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize the checkers model.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write a quantized model")
+    export_parser.add_argument("--model", default="trained_checkers_model.h5")
+    export_parser.add_argument("--dtype", choices=DTYPES, default="int8")
+    export_parser.add_argument("--output")
+
+    report_parser = subparsers.add_parser(
+        "report", help="Compare a quantized model against the float model"
+    )
+    report_parser.add_argument("--model", default="trained_checkers_model.h5")
+    report_parser.add_argument("--quantized", required=True)
+    report_parser.add_argument("--positions", type=int, default=2000)
+    report_parser.add_argument("--seed", type=int, default=12345)
+
+    args = parser.parse_args()
+
+    from tensorflow.keras.models import load_model
+
+    model = load_model(args.model)
+
+    if args.command == "export":
+        output = args.output or f"{os.path.splitext(args.model)[0]}.{args.dtype}.npz"
+        quantized = QuantizedModel.from_keras(model, args.dtype)
+        quantized.save(output)
+        float_size = sum(w.nbytes for w in model.get_weights())
+        print(
+            f"Weights: {float_size} bytes float32 -> {quantized.size_in_bytes()} "
+            f"bytes {args.dtype} ({float_size / quantized.size_in_bytes():.1f}x smaller)"
+        )
+    else:
+        quantized = QuantizedModel.load(args.quantized)
+        X = sample_positions(args.positions, args.seed)
+        report = accuracy_report(model, quantized, X)
+        print(f"Held-out positions: {report['positions']} (seed {args.seed})")
+        print(f"Top-1 agreement with float model: {report['top1_agreement']:.2%}")
+        print(f"Mean absolute error: {report['mean_abs_error']:.6f}")
+        print(f"Max absolute error: {report['max_abs_error']:.6f}")
+        print(
+            f"Batch inference: float {report['reference_seconds'] * 1000:.1f} ms, "
+            f"{quantized.dtype} {report['quantized_seconds'] * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import argparse
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from board import Board
+
+RESULTS = ("1-0", "0-1", "1/2-1/2", "2-0", "0-2", "1-1", "*")
+
+TAG_RE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+COMMENT_RE = re.compile(r"\{[^}]*\}")
+MOVE_NUMBER_RE = re.compile(r"^\d+\.+")
+MOVE_RE = re.compile(r"^(\d{1,2})((?:[-x:]\d{1,2})+)[!?]*$")
+
+
+class MoveParseError(ValueError):
+    pass
+
+
+class IllegalMoveError(ValueError):
+    pass
+
+
+class GameRecord:
+    # The raw movetext is kept so that a game with unparseable moves can
+    # still be reported by validate_game instead of failing the whole file.
+    def __init__(self, movetext, tags=None, result=None):
+        self.movetext = movetext
+        self.tags = tags or {}
+        self.result = result
+
+    @property
+    def moves(self):
+        return parse_moves(self.movetext)
+
+    def __repr__(self):
+        return f"GameRecord(result={self.result}, tags={self.tags})"
+
+
+def parse_move(text):
+    match = MOVE_RE.match(text.strip())
+    if not match:
+        raise MoveParseError(f"Unparseable move: {text!r}")
+    squares = [int(match.group(1))] + [
+        int(square) for square in re.split(r"[-x:]", match.group(2))[1:]
+    ]
+    for square in squares:
+        if not 1 <= square <= 32:
+            raise MoveParseError(f"Invalid square {square} in move {text!r}")
+    return squares
+
+
+def _strip_variations(text):
+    depth = 0
+    kept = []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            kept.append(char)
+    return "".join(kept)
+
+
+def parse_moves(text):
+    # Movetext in PDN or the dataset's comma separated notation, e.g.
+    # "1. 11-15 23-19 2. 8-11 22-17" or "11-15,23-19,8-11,22-17".
+    text = _strip_variations(COMMENT_RE.sub(" ", text))
+    moves = []
+    for token in re.split(r"[\s,;]+", text):
+        token = MOVE_NUMBER_RE.sub("", token)
+        if not token or token in RESULTS or token.startswith("$"):
+            continue
+        parse_move(token)
+        moves.append(token)
+    return moves
+
+
+def parse_pdn(text):
+    games = []
+    tags = {}
+    movetext = []
+
+    def finish():
+        body = " ".join(movetext)
+        if tags or body.strip():
+            tokens = re.split(r"[\s,;]+", COMMENT_RE.sub(" ", body).strip())
+            result = tags.get("Result")
+            if tokens and tokens[-1] in RESULTS:
+                result = tokens[-1]
+            games.append(GameRecord(body, dict(tags), result))
+
+    for line in text.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("["):
+            if movetext:
+                finish()
+                tags, movetext = {}, []
+            for key, value in TAG_RE.findall(stripped):
+                tags[key] = value
+        elif stripped:
+            movetext.append(stripped)
+    finish()
+    return games
+
+
+def find_move(board, color, squares):
+    coords = [board.position_to_coords(square) for square in squares]
+    matches = []
+    for move in board.get_legal_moves(color):
+        path = move[0]
+        if path[0] != coords[0] or path[-1] != coords[-1]:
+            continue
+        # Intermediate squares, when given, must match the jump route.
+        if len(coords) > 2 and list(path) != coords:
+            continue
+        matches.append(move)
+    return matches[0] if matches else None
+
+
+def replay(moves, first="B"):
+    board = Board()
+    color = first
+    canonical = []
+    for ply, text in enumerate(moves, 1):
+        squares = parse_move(text) if isinstance(text, str) else text
+        move = find_move(board, color, squares)
+        if move is None:
+            raise IllegalMoveError(f"Illegal move {text!r} at ply {ply}")
+        canonical.append(board.move_to_string(move))
+        board.make_move(move)
+        color = "W" if color == "B" else "B"
+    return board, canonical
+
+
+def validate_game(game):
+    try:
+        moves = parse_moves(game) if isinstance(game, str) else game
+        _, canonical = replay(moves)
+    except MoveParseError as e:
+        return "unparseable", str(e), None
+    except IllegalMoveError as e:
+        return "illegal", str(e), None
+    return "ok", None, canonical
+
+
+class ValidationReport:
+    def __init__(self, results, elapsed):
+        self.results = results
+        self.elapsed = elapsed
+        self.counts = {"ok": 0, "illegal": 0, "unparseable": 0}
+        for status, _, _ in results:
+            self.counts[status] += 1
+
+    def errors(self):
+        return [
+            (index, status, message)
+            for index, (status, message, _) in enumerate(self.results)
+            if status != "ok"
+        ]
+
+    def converted(self):
+        return [canonical for status, _, canonical in self.results if status == "ok"]
+
+    def summary(self):
+        total = len(self.results)
+        rate = total / self.elapsed if self.elapsed else 0.0
+        return (
+            f"{total} games: {self.counts['ok']} ok, {self.counts['illegal']} illegal, "
+            f"{self.counts['unparseable']} unparseable ({rate:.0f} games/sec)"
+        )
+
+
+def validate_games(games, workers=None, chunksize=256):
+    # games: movetext strings or lists of move strings.
+    start = time.perf_counter()
+    if workers == 1:
+        results = [validate_game(game) for game in games]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(validate_game, games, chunksize=chunksize))
+    return ValidationReport(results, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate checkers game records.")
+    parser.add_argument("pdn", nargs="*", help="PDN files to validate")
+    parser.add_argument(
+        "--dataset", action="store_true", help="Validate the historical games dataset"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--show-errors", type=int, default=20)
+    args = parser.parse_args()
+
+    games = []
+    for path in args.pdn:
+        with open(path, encoding="utf-8") as f:
+            games += [record.movetext for record in parse_pdn(f.read())]
+    if args.dataset:
+        from data import load_raw_games
+
+        # Raw strings, so unparseable games are reported and the indices
+        # match the dataset rows.
+        games += load_raw_games()
+
+    report = validate_games(games, args.workers)
+    print(report.summary())
+    for index, status, message in report.errors()[: args.show_errors]:
+        print(f"Game {index}: {status}: {message}")
+
+
+if __name__ == "__main__":
+    main()
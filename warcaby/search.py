@@ -0,0 +1,346 @@
+import copy
+import multiprocessing
+import os
+import time
+
+import evaluation
+from board import Board
+from evaluation import evaluate
+
+WIN_SCORE = 100000
+# Root siblings searched in parallel with the first move are bounded this far
+# below the previous iteration's best score (half a man).
+ASPIRATION_WINDOW = 50
+
+EXACT, LOWER, UPPER = 0, 1, 2
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class SearchResult:
+    def __init__(self, move, score, depth, nodes, elapsed):
+        self.move = move
+        self.score = score
+        self.depth = depth
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (
+            f"SearchResult(move={self.move}, score={self.score}, depth={self.depth}, "
+            f"nodes={self.nodes}, elapsed={self.elapsed:.2f}s)"
+        )
+
+
+def opponent(color):
+    return "W" if color == "B" else "B"
+
+
+class Searcher:
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self.nodes = 0
+        self.table = {}
+        self.weights_version = evaluation.version
+
+    def prepare(self, deadline):
+        # Table entries were scored with the weights of their time, so they
+        # are dropped once the evaluation weights change.
+        if self.weights_version != evaluation.version:
+            self.table.clear()
+            self.weights_version = evaluation.version
+        self.deadline = deadline
+
+    def search_root_move(self, board, color, move, depth, alpha=-WIN_SCORE):
+        undo = board.make_move(move)
+        try:
+            return -self.negamax(
+                board, opponent(color), depth - 1, -WIN_SCORE, -alpha, 1
+            )
+        finally:
+            board.unmake_move(move, undo)
+
+    def search_reply(self, board, color, move, reply, depth, alpha=-WIN_SCORE):
+        # Score of a root move when the opponent answers with reply; the
+        # move's score is the lowest over all replies.
+        undo = board.make_move(move)
+        reply_undo = board.make_move(reply)
+        try:
+            return self.negamax(board, color, depth - 2, alpha, WIN_SCORE, 2)
+        finally:
+            board.unmake_move(reply, reply_undo)
+            board.unmake_move(move, undo)
+
+    def negamax(self, board, color, depth, alpha, beta, ply):
+        self.nodes += 1
+        if (
+            self.deadline is not None
+            and self.nodes & 1023 == 0
+            and time.perf_counter() > self.deadline
+        ):
+            raise SearchTimeout()
+
+        moves = board.get_legal_moves(color)
+        if not moves:
+            return -WIN_SCORE + ply
+        # Captures are forced, so keep searching through them instead of
+        # scoring a position in the middle of an exchange.
+        if depth <= 0 and not moves[0][1]:
+            return evaluate(board, color)
+
+        key = (board.position_key(), color)
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, entry_score, entry_flag, table_move = entry
+            if entry_depth >= depth:
+                if entry_flag == EXACT:
+                    return entry_score
+                if entry_flag == LOWER and entry_score >= beta:
+                    return entry_score
+                if entry_flag == UPPER and entry_score <= alpha:
+                    return entry_score
+            if table_move in moves:
+                moves.remove(table_move)
+                moves.insert(0, table_move)
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE
+        best_move = moves[0]
+        for move in moves:
+            undo = board.make_move(move)
+            score = -self.negamax(
+                board, opponent(color), depth - 1, -beta, -alpha, ply + 1
+            )
+            board.unmake_move(move, undo)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best_score, flag, best_move)
+        return best_score
+
+
+# Each worker process keeps its own Searcher (and transposition table) for
+# the lifetime of the pool, so deeper iterations reuse earlier results.
+_worker_searcher = None
+
+
+def _init_worker(weights):
+    # Workers start with the weights of the process that created the pool,
+    # whether they were forked or spawned.
+    global _worker_searcher
+    evaluation.set_weights(weights)
+    _worker_searcher = Searcher()
+
+
+def _search_root_move(task):
+    board, color, move, depth, alpha, deadline = task
+    _worker_searcher.prepare(deadline)
+    nodes = _worker_searcher.nodes
+    try:
+        score = _worker_searcher.search_root_move(board, color, move, depth, alpha)
+    except SearchTimeout:
+        return None
+    return score, _worker_searcher.nodes - nodes
+
+
+def _search_reply(task):
+    board, color, move, reply, depth, alpha, deadline = task
+    _worker_searcher.prepare(deadline)
+    nodes = _worker_searcher.nodes
+    try:
+        score = _worker_searcher.search_reply(board, color, move, reply, depth, alpha)
+    except SearchTimeout:
+        return None
+    return score, _worker_searcher.nodes - nodes
+
+
+class ParallelSearch:
+    def __init__(self, workers=None, time_limit=1.0, max_depth=32):
+        self.workers = workers if workers is not None else os.cpu_count() or 1
+        if self.workers < 1:
+            raise ValueError("workers must be at least 1.")
+        self.time_limit = time_limit
+        self.max_depth = max_depth
+        self.pool = None
+        self.pool_version = None
+        self.searcher = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+            self.pool = None
+
+    def search(self, board, color):
+        start = time.perf_counter()
+        deadline = start + self.time_limit if self.time_limit else None
+        board = copy.deepcopy(board)
+
+        moves = board.get_legal_moves(color)
+        if not moves:
+            return SearchResult(None, -WIN_SCORE, 0, 0, 0.0)
+        if len(moves) == 1:
+            return SearchResult(moves[0], 0, 0, 0, time.perf_counter() - start)
+
+        best_move, best_score, completed_depth, nodes = moves[0], 0, 0, 0
+        order = list(range(len(moves)))
+        for depth in range(1, self.max_depth + 1):
+            guess = best_score if completed_depth else None
+            scores = self._search_depth(
+                board, color, [moves[i] for i in order], depth, deadline, guess
+            )
+            if scores is None:
+                break
+            for score, move_nodes in scores:
+                nodes += move_nodes
+
+            # Moves that failed low only have an upper bound, which still
+            # ranks them below the best move. Sort best-first; ties keep the
+            # previous order so results are reproducible with one worker.
+            ranked = sorted(
+                zip(order, (score for score, _ in scores)), key=lambda item: -item[1]
+            )
+            order = [index for index, _ in ranked]
+            best_move, best_score = moves[order[0]], ranked[0][1]
+            completed_depth = depth
+
+            if abs(best_score) >= WIN_SCORE - self.max_depth:
+                break
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+
+        return SearchResult(
+            best_move, best_score, completed_depth, nodes, time.perf_counter() - start
+        )
+
+    def _search_depth(self, board, color, moves, depth, deadline, guess=None):
+        if self.workers == 1:
+            if self.searcher is None:
+                self.searcher = Searcher()
+            self.searcher.prepare(deadline)
+            scores = []
+            alpha = -WIN_SCORE
+            for move in moves:
+                nodes = self.searcher.nodes
+                try:
+                    score = self.searcher.search_root_move(
+                        board, color, move, depth, alpha
+                    )
+                except SearchTimeout:
+                    return None
+                scores.append((score, self.searcher.nodes - nodes))
+                alpha = max(alpha, score)
+            return scores
+
+        # Root split: the expected best move and its siblings are searched at
+        # the same time, the siblings against a bound just below the previous
+        # iteration's best score. A sibling that failed low against that bound
+        # but above the first move's actual score is searched again.
+        if self.pool is not None and self.pool_version != evaluation.version:
+            # The workers hold the old weights and tables built from them.
+            self.close()
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(
+                self.workers,
+                initializer=_init_worker,
+                initargs=(dict(evaluation.weights),),
+            )
+            self.pool_version = evaluation.version
+        alpha = -WIN_SCORE if guess is None else guess - ASPIRATION_WINDOW
+        first = self.pool.apply_async(
+            _search_root_move, ((board, color, moves[0], depth, -WIN_SCORE, deadline),)
+        )
+        scores = self._search_siblings(board, color, moves[1:], depth, alpha, deadline)
+        first = first.get()
+        if first is None or scores is None:
+            return None
+
+        retry = [i for i, (score, _) in enumerate(scores) if first[0] < score <= alpha]
+        if retry:
+            results = self._search_siblings(
+                board, color, [moves[i + 1] for i in retry], depth, first[0], deadline
+            )
+            if results is None:
+                return None
+            for i, (score, nodes) in zip(retry, results):
+                scores[i] = (score, scores[i][1] + nodes)
+        return [first] + scores
+
+    def _search_siblings(self, board, color, moves, depth, alpha, deadline):
+        # A root split alone keeps at most len(moves) workers busy, often
+        # fewer than ten in checkers. With more workers than moves, every
+        # (move, reply) subtree becomes its own task instead. This gives up
+        # the cutoffs between replies of the same move.
+        if depth < 2 or self.workers <= len(moves):
+            tasks = [(board, color, move, depth, alpha, deadline) for move in moves]
+            results = self.pool.map(_search_root_move, tasks, chunksize=1)
+            if any(result is None for result in results):
+                return None
+            return results
+
+        owners, tasks = [], []
+        for index, move in enumerate(moves):
+            undo = board.make_move(move)
+            replies = board.get_legal_moves(opponent(color))
+            board.unmake_move(move, undo)
+            for reply in replies:
+                owners.append(index)
+                tasks.append((board, color, move, reply, depth, alpha, deadline))
+        results = self.pool.map(_search_reply, tasks, chunksize=1)
+        if any(result is None for result in results):
+            return None
+
+        # A move the opponent cannot answer wins at once.
+        scores = [WIN_SCORE - 1] * len(moves)
+        nodes = [0] * len(moves)
+        seen = set()
+        for index, (score, reply_nodes) in zip(owners, results):
+            scores[index] = score if index not in seen else min(scores[index], score)
+            nodes[index] += reply_nodes
+            seen.add(index)
+        return list(zip(scores, nodes))
+
+
+def search_move(board, color, workers=1, time_limit=1.0, max_depth=32):
+    with ParallelSearch(workers, time_limit, max_depth) as search:
+        return search.search(board, color)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Search the initial position.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--time", type=float, default=5.0)
+    parser.add_argument(
+        "--compare",
+        action="store_true",
+        help="Also search with one worker and compare the depth reached",
+    )
+    args = parser.parse_args()
+
+    board = Board()
+    for workers in sorted({1, args.workers}) if args.compare else [args.workers]:
+        result = search_move(board, "B", workers, args.time)
+        print(
+            f"{workers} worker(s): best move {board.move_to_string(result.move)}, "
+            f"depth {result.depth}, {result.nodes / result.elapsed:.0f} nodes/sec"
+        )
@@ -0,0 +1,305 @@
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from board import Board
+from quantize import QuantizedModel, board_to_input, keras_dense_layers
+
+INPUT_SIZE = 64
+OUTPUT_SIZE = 64
+
+
+class ReplayBuffer:
+    def __init__(self, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.states = np.zeros((capacity, INPUT_SIZE), dtype=np.float32)
+        self.policies = np.zeros((capacity, OUTPUT_SIZE), dtype=np.float32)
+        self.outcomes = np.zeros(capacity, dtype=np.float32)
+        self.index = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add(self, states, policies, outcomes):
+        count = len(states)
+        if count > self.capacity:
+            states = states[-self.capacity :]
+            policies = policies[-self.capacity :]
+            outcomes = outcomes[-self.capacity :]
+            count = self.capacity
+        positions = (self.index + np.arange(count)) % self.capacity
+        self.states[positions] = states
+        self.policies[positions] = policies
+        self.outcomes[positions] = outcomes
+        self.index = (self.index + count) % self.capacity
+        self.size = min(self.size + count, self.capacity)
+
+    def sample(self, batch_size, rng):
+        if self.size == 0:
+            raise ValueError("Cannot sample from an empty replay buffer.")
+        indices = rng.integers(0, self.size, size=batch_size)
+        return self.states[indices], self.policies[indices], self.outcomes[indices]
+
+
+def perspective(grid, color):
+    # The network always plays black moving down the board, so white
+    # positions are rotated by 180 degrees and the colours swapped.
+    if color == "B":
+        return grid
+    swap = {None: None, "B": "W", "W": "B", "BK": "WK", "WK": "BK"}
+    return [[swap[grid[7 - r][7 - c]] for c in range(8)] for r in range(8)]
+
+
+def move_target(board, move, color):
+    row, col = move[0][-1]
+    if color == "W":
+        row, col = 7 - row, 7 - col
+    # Matches CheckersAIModel.select_move: output index = target position - 1.
+    return board.coords_to_position(row, col) - 1
+
+
+def play_game(model, rng, epsilon=0.1, temperature=1.0, max_plies=200):
+    board = Board()
+    color = "B"
+    states, targets, movers = [], [], []
+    winner = None
+
+    for _ in range(max_plies):
+        moves = board.get_legal_moves(color)
+        if not moves:
+            winner = "W" if color == "B" else "B"
+            break
+
+        state = board_to_input(perspective(board.grid, color))
+        indices = [move_target(board, move, color) for move in moves]
+        if len(moves) == 1:
+            choice = 0
+        elif rng.random() < epsilon:
+            choice = rng.integers(len(moves))
+        else:
+            policy = model.predict(state[np.newaxis])[0]
+            scores = np.maximum(policy[indices], 1e-9) ** (1.0 / temperature)
+            choice = rng.choice(len(moves), p=scores / scores.sum())
+
+        states.append(state)
+        targets.append(indices[choice])
+        movers.append(color)
+        board.make_move(moves[choice])
+        color = "W" if color == "B" else "B"
+
+    outcomes = [
+        0.0 if winner is None else (1.0 if mover == winner else -1.0)
+        for mover in movers
+    ]
+    policies = np.zeros((len(states), OUTPUT_SIZE), dtype=np.float32)
+    policies[np.arange(len(states)), targets] = 1.0
+    return np.array(states), policies, np.array(outcomes, dtype=np.float32), winner
+
+
+# Worker processes load the NumPy network from the weights file only when a
+# new version of the weights is promoted; tasks carry just its path. The path
+# is unique per trainer and version, so it also keys the loaded model: with
+# one worker the games run in the trainer's own process, which may have run
+# other trainers before.
+_worker_model = None
+_worker_weights_path = None
+
+
+def play_games(task):
+    global _worker_model, _worker_weights_path
+    weights_path, seed, games, epsilon, temperature, max_plies = task
+    if _worker_weights_path != weights_path:
+        _worker_model = QuantizedModel.load(weights_path)
+        _worker_weights_path = weights_path
+
+    rng = np.random.default_rng(seed)
+    results = []
+    for _ in range(games):
+        results.append(play_game(_worker_model, rng, epsilon, temperature, max_plies))
+    return results
+
+
+class SelfPlayTrainer:
+    def __init__(
+        self,
+        ai_model,
+        workers=1,
+        buffer_capacity=100000,
+        games_per_iteration=32,
+        batch_size=256,
+        train_steps=50,
+        promote_every=1,
+        epsilon=0.1,
+        temperature=1.0,
+        max_plies=200,
+        seed=0,
+    ):
+        self.ai_model = ai_model
+        self.workers = workers
+        self.buffer = ReplayBuffer(buffer_capacity)
+        self.games_per_iteration = games_per_iteration
+        self.batch_size = batch_size
+        self.train_steps = train_steps
+        self.promote_every = promote_every
+        self.epsilon = epsilon
+        self.temperature = temperature
+        self.max_plies = max_plies
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed
+        self.version = 0
+        self.weights, self.activations = keras_dense_layers(ai_model.model)
+        self.weights_dir = None
+        self.weights_path = None
+        self.pool = None
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.weights_dir is not None:
+            shutil.rmtree(self.weights_dir, ignore_errors=True)
+            self.weights_dir = None
+            self.weights_path = None
+
+    def publish(self):
+        # Workers read the weights from this file once per version instead of
+        # receiving them with every task.
+        if self.weights_dir is None:
+            self.weights_dir = tempfile.mkdtemp(prefix="selfplay-")
+        elif self.weights_path is not None:
+            os.remove(self.weights_path)
+        self.weights_path = os.path.join(
+            self.weights_dir, f"weights-{self.version}.npz"
+        )
+        QuantizedModel.from_weights(self.weights, self.activations, "float32").save(
+            self.weights_path
+        )
+
+    def generate(self, iteration):
+        if self.weights_path is None:
+            self.publish()
+        chunks = [
+            self.games_per_iteration // self.workers
+            + (1 if i < self.games_per_iteration % self.workers else 0)
+            for i in range(self.workers)
+        ]
+        tasks = [
+            (
+                self.weights_path,
+                random.Random(f"{self.seed}-{iteration}-{i}").getrandbits(32),
+                games,
+                self.epsilon,
+                self.temperature,
+                self.max_plies,
+            )
+            for i, games in enumerate(chunks)
+            if games
+        ]
+        if self.workers == 1:
+            batches = [play_games(task) for task in tasks]
+        else:
+            if self.pool is None:
+                # TensorFlow is already initialised in this process, and
+                # forking it can deadlock the workers.
+                self.pool = multiprocessing.get_context("spawn").Pool(self.workers)
+            batches = self.pool.map(play_games, tasks)
+        return [game for batch in batches for game in batch]
+
+    def train(self):
+        samples = self.train_steps * self.batch_size
+        X, y, outcomes = self.buffer.sample(samples, self.rng)
+        # Reinforce the winner's moves, half-weight draws, ignore the loser's.
+        sample_weight = (outcomes + 1.0) / 2.0
+        self.ai_model.train(
+            X, y, epochs=1, batch_size=self.batch_size, sample_weight=sample_weight
+        )
+        return samples
+
+    def promote(self, filepath):
+        self.weights, self.activations = keras_dense_layers(self.ai_model.model)
+        self.version += 1
+        self.publish()
+        self.ai_model.save_model(filepath)
+        print(f"Promoted weights version {self.version} to self-play workers")
+
+    def run(self, iterations, filepath="trained_checkers_model.h5"):
+        try:
+            for iteration in range(1, iterations + 1):
+                start = time.perf_counter()
+                games = self.generate(iteration)
+                generation_time = time.perf_counter() - start
+                for states, policies, outcomes, _ in games:
+                    self.buffer.add(states, policies, outcomes)
+
+                wins = {"B": 0, "W": 0, None: 0}
+                for game in games:
+                    wins[game[3]] += 1
+                print(
+                    f"Iteration {iteration}: {len(games)} games "
+                    f"(black {wins['B']}, white {wins['W']}, draws {wins[None]}), "
+                    f"{len(games) * 3600 / generation_time:.0f} games/hour, "
+                    f"buffer {len(self.buffer)}/{self.buffer.capacity}"
+                )
+
+                start = time.perf_counter()
+                samples = self.train()
+                train_time = time.perf_counter() - start
+                print(
+                    f"Iteration {iteration}: trained on {samples} samples, "
+                    f"{samples / train_time:.0f} samples/sec"
+                )
+
+                if iteration % self.promote_every == 0:
+                    self.promote(filepath)
+        finally:
+            self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the checkers model by self-play."
+    )
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--games-per-iteration", type=int, default=32)
+    parser.add_argument("--buffer-capacity", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--train-steps", type=int, default=50)
+    parser.add_argument("--promote-every", type=int, default=1)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--temperature", type=float, default=1.0)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="trained_checkers_model.h5")
+    args = parser.parse_args()
+
+    from ai import CheckersAIModel
+
+    trainer = SelfPlayTrainer(
+        CheckersAIModel(),
+        workers=args.workers,
+        buffer_capacity=args.buffer_capacity,
+        games_per_iteration=args.games_per_iteration,
+        batch_size=args.batch_size,
+        train_steps=args.train_steps,
+        promote_every=args.promote_every,
+        epsilon=args.epsilon,
+        temperature=args.temperature,
+        max_plies=args.max_plies,
+        seed=args.seed,
+    )
+    trainer.run(args.iterations, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ai import CheckersAIModel
+
+# Protocol: one JSON object per line in each direction.
+#   request:  {"positions": [{"board": [[...8 cells...] x 8], "last_move": [from, to] | null}, ...]}
+#   response: {"results": [{"move": "A-B", "predictions": [...64 floats...]} | {"error": "..."}, ...]}
+
+CELLS = (None, "B", "W", "BK", "WK")
+# One position is about 420 bytes of JSON, so the default asyncio limit of
+# 64 KiB per line would cap requests at roughly 150 positions.
+DEFAULT_STREAM_LIMIT = 8 * 1024 * 1024
+
+
+def validate_board(board_state):
+    # Positions are checked before they are queued, so a malformed board can
+    # only fail its own request and never the batch it would have joined.
+    if not isinstance(board_state, list) or len(board_state) != 8:
+        raise ValueError("board must be a list of 8 rows")
+    for row in board_state:
+        if not isinstance(row, list) or len(row) != 8:
+            raise ValueError("each board row must be a list of 8 cells")
+        for cell in row:
+            if cell not in CELLS:
+                raise ValueError(f"invalid cell {cell!r}, must be one of {CELLS}")
+
+
+def validate_last_move(last_move):
+    if last_move is None:
+        return None
+    if (
+        not isinstance(last_move, list)
+        or len(last_move) != 2
+        or not all(
+            isinstance(square, int)
+            and not isinstance(square, bool)
+            and 1 <= square <= 32
+            for square in last_move
+        )
+    ):
+        raise ValueError("last_move must be null or a pair of squares 1-32")
+    return tuple(last_move)
+
+
+class EvaluationServer:
+    def __init__(
+        self,
+        model=None,
+        max_batch_size=64,
+        max_wait_ms=5.0,
+        stream_limit=DEFAULT_STREAM_LIMIT,
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1.")
+        self.stream_limit = stream_limit
+        self.model = model if model is not None else CheckersAIModel()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = None
+        # A single inference thread keeps the event loop responsive while
+        # guaranteeing that only one forward pass runs at a time.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.batches = 0
+        self.positions = 0
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        self.queue = asyncio.Queue()
+        batcher = asyncio.create_task(self._batch_loop())
+        if unix_path:
+            server = await asyncio.start_unix_server(
+                self._handle_client, path=unix_path, limit=self.stream_limit
+            )
+            print(f"Evaluation server listening on {unix_path}")
+        else:
+            server = await asyncio.start_server(
+                self._handle_client, host, port, limit=self.stream_limit
+            )
+            print(f"Evaluation server listening on {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def evaluate(self, board_state, last_move=None):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((board_state, last_move, future))
+        return await future
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await self._read_line(reader)
+                if line == b"":
+                    break
+                if line is None:
+                    response = {
+                        "error": f"Request longer than {self.stream_limit} bytes"
+                    }
+                else:
+                    response = await self._handle_request(line)
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _read_line(self, reader):
+        # Returns None for a line over the stream limit. The rest of that line
+        # is discarded, so the client gets an error and can keep the
+        # connection.
+        overrun = False
+        while True:
+            try:
+                line = await reader.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                line = e.partial
+            except asyncio.LimitOverrunError as e:
+                await reader.readexactly(e.consumed)
+                overrun = True
+                continue
+            return None if overrun else line
+
+    async def _handle_request(self, line):
+        try:
+            request = json.loads(line)
+            positions = request["positions"]
+            if not isinstance(positions, list):
+                raise TypeError("positions must be a list")
+        except (ValueError, KeyError, TypeError) as e:
+            return {"error": f"Malformed request: {e}"}
+
+        tasks = []
+        for position in positions:
+            try:
+                board_state = position["board"]
+                validate_board(board_state)
+                last_move = validate_last_move(position.get("last_move"))
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                tasks.append(self._error(f"Malformed position: {e}"))
+                continue
+            tasks.append(self.evaluate(board_state, last_move))
+
+        return {"results": await asyncio.gather(*tasks)}
+
+    async def _error(self, message):
+        return {"error": message}
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                results = await loop.run_in_executor(
+                    self.executor, self._run_batch, batch
+                )
+            except Exception as e:
+                results = [{"error": f"Inference failed: {e}"}] * len(batch)
+
+            for (_, _, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def _run_batch(self, batch):
+        start = time.perf_counter()
+        board_states = [board_state for board_state, _, _ in batch]
+        predictions = self.model.predict_batch(board_states)
+
+        results = []
+        for (board_state, last_move, _), prediction in zip(batch, predictions):
+            try:
+                move = self.model.select_move(
+                    board_state, prediction, last_move, quiet=True
+                )
+                results.append({"move": move, "predictions": prediction.tolist()})
+            except (ValueError, IndexError, TypeError) as e:
+                results.append({"error": str(e), "predictions": prediction.tolist()})
+
+        self.batches += 1
+        self.positions += len(batch)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"Evaluated batch of {len(batch)} positions in {elapsed:.1f} ms "
+            f"(total: {self.positions} positions in {self.batches} batches)"
+        )
+        return results
+
+
+def request_moves(positions, host="127.0.0.1", port=8765, unix_path=None):
+    payload = {
+        "positions": [
+            {"board": board_state, "last_move": last_move}
+            for board_state, last_move in positions
+        ]
+    }
+    if unix_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(unix_path)
+    else:
+        sock = socket.create_connection((host, port))
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(payload).encode() + b"\n")
+        stream.flush()
+        response = json.loads(stream.readline())
+    if "error" in response:
+        raise ValueError(response["error"])
+    return response["results"]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve CheckersAIModel move predictions over a local socket."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", dest="unix_path", help="Unix socket path")
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument(
+        "--max-request-mb",
+        type=float,
+        default=DEFAULT_STREAM_LIMIT / (1024 * 1024),
+        help="Longest request line accepted",
+    )
+    args = parser.parse_args()
+
+    server = EvaluationServer(
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        stream_limit=int(args.max_request_mb * 1024 * 1024),
+    )
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix_path))
+    except KeyboardInterrupt:
+        print("Evaluation server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from board import Board
+from search import ParallelSearch
+
+
+class RandomEngine:
+    # deterministic() takes the engine's options and tells whether it always
+    # plays the same game from the same opening against a fixed opponent.
+    @staticmethod
+    def deterministic(seed=0):
+        return False
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def new_game(self, game_seed):
+        # Reseeded from the task so that every game gets its own stream, no
+        # matter which worker process plays it.
+        self.rng.seed(f"{self.seed}-{game_seed}")
+
+    def choose_move(self, board, color, moves):
+        return self.rng.choice(moves)
+
+
+class SearchEngine:
+    @staticmethod
+    def deterministic(time_limit=0.1, max_depth=32):
+        # Time limited searches stop at a different node on every run.
+        return not time_limit
+
+    def __init__(self, time_limit=0.1, max_depth=32):
+        self.search = ParallelSearch(1, time_limit, max_depth)
+
+    def new_game(self, game_seed):
+        # Start every game with an empty transposition table.
+        self.search.searcher = None
+
+    def choose_move(self, board, color, moves):
+        return self.search.search(board, color).move
+
+
+class PolicyEngine:
+    @staticmethod
+    def deterministic(model):
+        return True
+
+    def __init__(self, model):
+        from quantize import QuantizedModel
+
+        self.model = QuantizedModel.load(model)
+
+    def new_game(self, game_seed):
+        pass
+
+    def choose_move(self, board, color, moves):
+        from quantize import board_to_input
+        from selfplay import move_target, perspective
+
+        state = board_to_input(perspective(board.grid, color))
+        policy = self.model.predict(state[None])[0]
+        return max(moves, key=lambda move: policy[move_target(board, move, color)])
+
+
+ENGINES = {"random": RandomEngine, "search": SearchEngine, "policy": PolicyEngine}
+
+
+def parse_engine(spec):
+    # "search:time_limit=0.1,max_depth=8", "policy:model=model.int8.npz", "random"
+    kind, _, options = spec.partition(":")
+    if kind not in ENGINES:
+        raise ValueError(
+            f"Unknown engine kind: {kind}. Must be one of {sorted(ENGINES)}."
+        )
+    kwargs = {}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        for convert in (int, float):
+            try:
+                value = convert(value)
+                break
+            except ValueError:
+                pass
+        kwargs[key] = value
+    return kind, kwargs
+
+
+def generate_openings(plies=3, max_imbalance=50):
+    openings = []
+
+    def extend(board, color, moves):
+        if len(moves) == plies:
+            if abs(board.score) <= max_imbalance:
+                openings.append(list(moves))
+            return
+        for move in board.get_legal_moves(color):
+            undo = board.make_move(move)
+            moves.append(move)
+            extend(board, "W" if color == "B" else "B", moves)
+            moves.pop()
+            board.unmake_move(move, undo)
+
+    extend(Board(), "B", [])
+    return openings
+
+
+# Engines are created once per worker process and reused between games.
+_engines = {}
+
+
+def _get_engine(spec):
+    if spec not in _engines:
+        kind, kwargs = parse_engine(spec)
+        _engines[spec] = ENGINES[kind](**kwargs)
+    return _engines[spec]
+
+
+def play_game(task):
+    opening, black_spec, white_spec, max_plies, _, seed = task
+    board = Board()
+    color = "B"
+    for move in opening:
+        board.make_move(move)
+        color = "W" if color == "B" else "B"
+
+    engines = {"B": _get_engine(black_spec), "W": _get_engine(white_spec)}
+    for color, engine in engines.items():
+        engine.new_game(f"{seed}-{color}")
+    think_time = {"B": 0.0, "W": 0.0}
+    move_count = {"B": 0, "W": 0}
+    seen = {}
+    winner = None
+
+    for _ in range(max_plies):
+        moves = board.get_legal_moves(color)
+        if not moves:
+            winner = "W" if color == "B" else "B"
+            break
+        key = (board.position_key(), color)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] >= 3:
+            break
+
+        start = time.perf_counter()
+        move = engines[color].choose_move(board, color, moves)
+        think_time[color] += time.perf_counter() - start
+        move_count[color] += 1
+        board.make_move(move)
+        color = "W" if color == "B" else "B"
+
+    return winner, think_time, move_count
+
+
+def score_interval(wins, draws, losses, z=1.96):
+    # Wilson score interval. Unlike score +- z * stddev it does not collapse
+    # to zero width for one-sided results and stays inside [0, 1].
+    games = wins + draws + losses
+    score = (wins + 0.5 * draws) / games
+    denominator = 1 + z**2 / games
+    center = (score + z**2 / (2 * games)) / denominator
+    margin = (
+        z * math.sqrt(score * (1 - score) / games + z**2 / (4 * games**2)) / denominator
+    )
+    return score, max(center - margin, 0.0), min(center + margin, 1.0)
+
+
+def elo_from_score(score):
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_from_elo(elo):
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def _constrained_mle(frequencies, scores, expected):
+    # Maximum likelihood outcome probabilities with the given expected score:
+    # p_i = f_i / (1 + theta * (a_i - expected)), theta found by bisection.
+    def excess(theta):
+        return sum(
+            f * (a - expected) / (1 + theta * (a - expected))
+            for f, a in zip(frequencies, scores)
+        )
+
+    low, high = -1 / (max(scores) - expected), 1 / (expected - min(scores))
+    low, high = low * (1 - 1e-9), high * (1 - 1e-9)
+    for _ in range(100):
+        theta = (low + high) / 2
+        if excess(theta) > 0:
+            low = theta
+        else:
+            high = theta
+    return [f / (1 + theta * (a - expected)) for f, a in zip(frequencies, scores)]
+
+
+def sprt_llr(wins, draws, losses, elo0, elo1):
+    # Generalised SPRT on the trinomial (win, draw, loss) distribution: the
+    # log-likelihood ratio of the most likely distributions whose expected
+    # scores match elo1 and elo0. Outcomes that have not occurred yet get a
+    # tiny count so that both distributions exist.
+    if wins + draws + losses == 0:
+        return 0.0
+    counts = [count or 1e-3 for count in (wins, draws, losses)]
+    total = sum(counts)
+    frequencies = [count / total for count in counts]
+    scores = (1.0, 0.5, 0.0)
+    p0 = _constrained_mle(frequencies, scores, score_from_elo(elo0))
+    p1 = _constrained_mle(frequencies, scores, score_from_elo(elo1))
+    return sum(
+        count * math.log(b / a)
+        for count, a, b in zip((wins, draws, losses), p0, p1)
+        if count
+    )
+
+
+def sprt_bounds(alpha, beta):
+    return math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)
+
+
+class Tournament:
+    def __init__(
+        self,
+        engine_a,
+        engine_b,
+        openings,
+        workers=None,
+        max_plies=200,
+        sprt=None,
+    ):
+        self.engine_a = engine_a
+        self.engine_b = engine_b
+        self.openings = openings
+        self.workers = workers or os.cpu_count() or 1
+        self.max_plies = max_plies
+        # sprt: (elo0, elo1, alpha, beta) or None to play every game.
+        self.sprt = sprt
+        self.wins = self.draws = self.losses = 0
+        self.think_time = {"A": 0.0, "B": 0.0}
+        self.move_count = {"A": 0, "B": 0}
+        self.verdict = None
+
+    def tasks(self):
+        # Every opening is played twice with colours swapped. The last items
+        # are the colour engine A plays and the game's seed.
+        for index, opening in enumerate(self.openings):
+            seed = 2 * index
+            yield opening, self.engine_a, self.engine_b, self.max_plies, "B", seed
+            yield opening, self.engine_b, self.engine_a, self.max_plies, "W", seed + 1
+
+    def record(self, task, result):
+        a_color = task[4]
+        winner, think_time, move_count = result
+        if winner is None:
+            self.draws += 1
+        elif winner == a_color:
+            self.wins += 1
+        else:
+            self.losses += 1
+        b_color = "W" if a_color == "B" else "B"
+        for slot, color in (("A", a_color), ("B", b_color)):
+            self.think_time[slot] += think_time[color]
+            self.move_count[slot] += move_count[color]
+
+        if self.sprt is not None:
+            elo0, elo1, alpha, beta = self.sprt
+            lower, upper = sprt_bounds(alpha, beta)
+            llr = sprt_llr(self.wins, self.draws, self.losses, elo0, elo1)
+            if llr >= upper:
+                self.verdict = "H1 accepted"
+            elif llr <= lower:
+                self.verdict = "H0 accepted"
+
+    def run(self):
+        start = time.perf_counter()
+        tasks = iter(self.tasks())
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            pending = {}
+            for task in tasks:
+                pending[executor.submit(play_game, task)] = task
+                if len(pending) >= self.workers * 2:
+                    break
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    self.record(pending.pop(future), future.result())
+                if self.verdict is not None:
+                    for future in pending:
+                        future.cancel()
+                    break
+                for task in tasks:
+                    pending[executor.submit(play_game, task)] = task
+                    if len(pending) >= self.workers * 2:
+                        break
+                self.print_progress()
+        self.elapsed = time.perf_counter() - start
+        return self
+
+    def print_progress(self):
+        games = self.wins + self.draws + self.losses
+        if games % 10 == 0:
+            print(f"Games: {games}, +{self.wins} ={self.draws} -{self.losses}")
+
+    def summary(self):
+        games = self.wins + self.draws + self.losses
+        lines = [f"{self.engine_a} vs {self.engine_b}: {games} games"]
+        lines.append(f"Result: +{self.wins} ={self.draws} -{self.losses}")
+        if games:
+            score, low, high = score_interval(self.wins, self.draws, self.losses)
+            elo = elo_from_score(score)
+            lines.append(
+                f"Score: {score:.3f}, Elo: {elo:+.1f} "
+                f"(95% CI {elo_from_score(low):+.1f} .. {elo_from_score(high):+.1f})"
+            )
+        if self.sprt is not None:
+            elo0, elo1, alpha, beta = self.sprt
+            lower, upper = sprt_bounds(alpha, beta)
+            llr = sprt_llr(self.wins, self.draws, self.losses, elo0, elo1)
+            lines.append(
+                f"SPRT [{elo0}, {elo1}]: LLR {llr:.2f} ({lower:.2f}, {upper:.2f}), "
+                f"{self.verdict or 'inconclusive'}"
+            )
+        for slot, spec in (("A", self.engine_a), ("B", self.engine_b)):
+            if self.move_count[slot]:
+                average = self.think_time[slot] / self.move_count[slot] * 1000
+                lines.append(f"{spec}: {average:.1f} ms/move")
+        return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play two engines against each other.")
+    parser.add_argument("engine_a", help='e.g. "search:time_limit=0.05"')
+    parser.add_argument(
+        "engine_b", help='e.g. "policy:model=trained_checkers_model.int8.npz"'
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--opening-plies", type=int, default=3)
+    parser.add_argument("--max-imbalance", type=int, default=50)
+    parser.add_argument("--max-plies", type=int, default=200)
+    parser.add_argument(
+        "--rounds", type=int, default=1, help="Times to repeat the opening suite"
+    )
+    parser.add_argument(
+        "--sprt",
+        nargs=2,
+        type=float,
+        metavar=("ELO0", "ELO1"),
+        help="Stop early once the SPRT between ELO0 and ELO1 is decided",
+    )
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--beta", type=float, default=0.05)
+    args = parser.parse_args()
+
+    deterministic = []
+    for spec in (args.engine_a, args.engine_b):
+        kind, kwargs = parse_engine(spec)
+        deterministic.append(ENGINES[kind].deterministic(**kwargs))
+    if args.rounds > 1 and all(deterministic):
+        # Every round would replay the same games and only narrow the
+        # confidence interval with duplicate evidence.
+        parser.error("--rounds needs at least one engine that is not deterministic")
+    openings = generate_openings(args.opening_plies, args.max_imbalance) * args.rounds
+    print(f"Playing {len(openings) * 2} games from {len(openings)} openings")
+
+    sprt = (args.sprt[0], args.sprt[1], args.alpha, args.beta) if args.sprt else None
+    tournament = Tournament(
+        args.engine_a, args.engine_b, openings, args.workers, args.max_plies, sprt
+    ).run()
+    print(tournament.summary())
+    print(f"Finished in {tournament.elapsed:.1f}s")
+
+
+if __name__ == "__main__":
+    main()